@@ -14,11 +14,18 @@
 
 from collections import Counter
 from functools import cached_property
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 
 from attrs import frozen
 
-from .composite_bloq import _binst_to_cxns, _cxns_to_soq_dict, _map_soqs, _reg_to_soq, BloqBuilder
+from .composite_bloq import (
+    _binst_to_cxns,
+    _cxns_to_soq_dict,
+    _map_soqs,
+    _reg_to_soq,
+    _update_soq_map,
+    BloqBuilder,
+)
 from .gate_with_registers import GateWithRegisters
 from .quantum_graph import LeftDangle, RightDangle
 from .registers import Signature
@@ -26,7 +33,7 @@ from .registers import Signature
 if TYPE_CHECKING:
     import cirq
 
-    from qualtran import Bloq, CompositeBloq, Register, Signature, SoquetT
+    from qualtran import Bloq, CompositeBloq, Register, Signature, Soquet, SoquetT
     from qualtran.drawing import WireSymbol
     from qualtran.resource_counting import BloqCountDictT, SympySymbolAllocator
 
@@ -59,7 +66,7 @@ def _adjoint_cbloq(cbloq: 'CompositeBloq') -> 'CompositeBloq':
     new_signature = cbloq.signature.adjoint()
     old_i_soqs = [_reg_to_soq(RightDangle, reg) for reg in old_signature.rights()]
     new_i_soqs = [_reg_to_soq(LeftDangle, reg) for reg in new_signature.lefts()]
-    soq_map: List[Tuple[SoquetT, SoquetT]] = list(zip(old_i_soqs, new_i_soqs))
+    soq_map: Dict['Soquet', 'Soquet'] = _update_soq_map({}, zip(old_i_soqs, new_i_soqs))
 
     # Then we reverse the order of subbloqs
     bloqnections = reversed(list(cbloq.iter_bloqnections()))
@@ -79,7 +86,7 @@ def _adjoint_cbloq(cbloq: 'CompositeBloq') -> 'CompositeBloq':
 
         old_o_soqs = tuple(_reg_to_soq(binst, reg) for reg in binst.bloq.signature.lefts())
         new_o_soqs = bb.add_t(binst.bloq.adjoint(), **soqs)
-        soq_map.extend(zip(old_o_soqs, new_o_soqs))
+        _update_soq_map(soq_map, zip(old_o_soqs, new_o_soqs))
 
     # Instead of finalizing with RightDangle predecessors, we use LeftDangle successors
     fsoqs = _map_soqs(_adjoint_final_soqs(cbloq, new_signature), soq_map)
@@ -12,7 +12,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from typing import Iterator, TYPE_CHECKING
+import heapq
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
 
 import networkx as nx
 
@@ -61,8 +62,9 @@ def greedy_topological_sort(binst_graph: nx.DiGraph) -> Iterator['BloqInstance']
 
     The stability condition guarantees that two networkx graphs constructed with
     identical ordering of Graph.nodes and Graph.edges will have the same topological
-    sorting. The method delegates to `networkx.lexicographical_topological_sort` with
-    the `_priority` function used as a key.
+    sorting. The ordering is identical to `networkx.lexicographical_topological_sort` with
+    the `_priority` function used as a key, but the heap only ever compares
+    `(priority, insertion_index)` integer pairs and each node's priority is computed once.
 
     Args:
         binst_graph: A networkx DiGraph with `BloqInstances` as nodes. Usually obtained
@@ -73,4 +75,25 @@ def greedy_topological_sort(binst_graph: nx.DiGraph) -> Iterator['BloqInstance']
         goal to minimize qubit allocations and deallocations by pushing allocations to the
         right and de-allocations to the left.
     """
-    yield from nx.lexicographical_topological_sort(binst_graph, key=_priority)
+    node_ids: Dict['BloqInstance', int] = {node: i for i, node in enumerate(binst_graph)}
+    in_degree: Dict['BloqInstance', int] = {}
+    ready: List[Tuple[int, int, 'BloqInstance']] = []
+    for node, degree in binst_graph.in_degree():
+        if degree:
+            in_degree[node] = degree
+        else:
+            ready.append((_priority(node), node_ids[node], node))
+    heapq.heapify(ready)
+
+    succ = binst_graph.succ
+    while ready:
+        _, _, node = heapq.heappop(ready)
+        for child in succ[node]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                del in_degree[child]
+                heapq.heappush(ready, (_priority(child), node_ids[child], child))
+        yield node
+
+    if in_degree:
+        raise nx.NetworkXUnfeasible("The bloq instance graph contains a cycle.")
@@ -12,6 +12,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import networkx as nx
+import pytest
 from attrs import frozen
 
 from qualtran import (
@@ -25,7 +27,7 @@ from qualtran import (
     Signature,
     SoquetT,
 )
-from qualtran._infra.binst_graph_iterators import greedy_topological_sort
+from qualtran._infra.binst_graph_iterators import _priority, greedy_topological_sort
 from qualtran.bloqs.basic_gates import CNOT
 from qualtran.bloqs.bookkeeping import Allocate, Free
 
@@ -61,3 +63,18 @@ def test_greedy_topological_sort():
         BloqInstance(bloq=Free(dtype=QBit()), i=5),
         RightDangle,
     ]
+
+
+@pytest.mark.parametrize('rounds', [1, 2, 5])
+def test_greedy_topological_sort_matches_networkx(rounds):
+    cbloq = MultiAlloc(rounds=rounds).decompose_bloq()
+    binst_graph = cbloq._binst_graph
+    expected = [*nx.lexicographical_topological_sort(binst_graph, key=_priority)]
+    assert [*greedy_topological_sort(binst_graph)] == expected
+    assert list(cbloq._binst_order) == expected[1:-1]
+
+
+def test_greedy_topological_sort_cycle():
+    binst_graph = nx.DiGraph([(LeftDangle, RightDangle), (RightDangle, LeftDangle)])
+    with pytest.raises(nx.NetworkXUnfeasible):
+        _ = [*greedy_topological_sort(binst_graph)]
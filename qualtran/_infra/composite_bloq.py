@@ -139,6 +139,59 @@ class CompositeBloq(Bloq):
         """
         return _create_binst_graph(self.connections, self.bloq_instances)
 
+    @cached_property
+    def _binst_cxns(
+        self,
+    ) -> Dict[Union[BloqInstance, DanglingT], Tuple[List[Connection], List[Connection]]]:
+        """A cached mapping from each node of `_binst_graph` to its (predecessor, successor)
+        connections.
+
+        The connection lists are shared between calls and must not be mutated.
+        """
+        g = self._binst_graph
+        return {binst: _binst_to_cxns(binst, binst_graph=g) for binst in g}
+
+    @cached_property
+    def _binst_generations(self) -> Tuple[Tuple[Union[BloqInstance, DanglingT], ...], ...]:
+        """The topological generations of `_binst_graph`, including dangling nodes.
+
+        This is a plain Kahn's-algorithm pass over the graph's adjacency that yields the
+        same generations (in the same order) as `nx.topological_generations`, computed once
+        per composite bloq.
+        """
+        g = self._binst_graph
+        succ = g.succ
+        in_degree = {binst: d for binst, d in g.in_degree() if d > 0}
+        generation = [binst for binst, d in g.in_degree() if d == 0]
+        generations = []
+        while generation:
+            generations.append(tuple(generation))
+            next_generation = []
+            for binst in generation:
+                for child in succ[binst]:
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        next_generation.append(child)
+                        del in_degree[child]
+            generation = next_generation
+
+        if in_degree:
+            raise nx.NetworkXUnfeasible("The bloq instance graph contains a cycle.")
+        return tuple(generations)
+
+    @cached_property
+    def _binst_order(self) -> Tuple[BloqInstance, ...]:
+        """The non-dangling bloq instances in greedy topological order.
+
+        This is computed once per composite bloq so repeated calls to `iter_bloqnections`
+        and `iter_bloqsoqs` do not re-sort the graph.
+        """
+        return tuple(
+            binst
+            for binst in greedy_topological_sort(self._binst_graph)
+            if not isinstance(binst, DanglingT)
+        )
+
     def as_cirq_op(
         self, qubit_manager: 'cirq.QubitManager', **cirq_quregs: 'CirqQuregT'
     ) -> Tuple['cirq.Operation', Dict[str, 'CirqQuregT']]:
@@ -257,11 +310,9 @@ class CompositeBloq(Bloq):
             Every connection that does not involve a dangling node will appear twice: once as
             a predecessor and again as a successor.
         """
-        g = self._binst_graph
-        for binst in greedy_topological_sort(g):
-            if isinstance(binst, DanglingT):
-                continue
-            pred_cxns, succ_cxns = _binst_to_cxns(binst, binst_graph=g)
+        binst_cxns = self._binst_cxns
+        for binst in self._binst_order:
+            pred_cxns, succ_cxns = binst_cxns[binst]
             yield binst, pred_cxns, succ_cxns
 
     def iter_bloqsoqs(
@@ -304,9 +355,9 @@ class CompositeBloq(Bloq):
 
         This method is helpful for finalizing an "add from" operation, see `iter_bloqsoqs`.
         """
-        if RightDangle not in self._binst_graph:
+        if RightDangle not in self._binst_cxns:
             return {}
-        final_preds, _ = _binst_to_cxns(RightDangle, binst_graph=self._binst_graph)
+        final_preds, _ = self._binst_cxns[RightDangle]
         return _cxns_to_soq_dict(
             self.signature.rights(),
             final_preds,
@@ -317,11 +368,11 @@ class CompositeBloq(Bloq):
     def copy(self) -> 'CompositeBloq':
         """Create a copy of this composite bloq by re-building it."""
         bb, _ = BloqBuilder.from_signature(self.signature)
-        soq_map: List[Tuple[SoquetT, SoquetT]] = []
+        soq_map: Dict[Soquet, Soquet] = {}
         for binst, in_soqs, old_out_soqs in self.iter_bloqsoqs():
             in_soqs = _map_soqs(in_soqs, soq_map)
             new_out_soqs = bb.add_t(binst.bloq, **in_soqs)
-            soq_map.extend(zip(old_out_soqs, new_out_soqs))
+            _update_soq_map(soq_map, zip(old_out_soqs, new_out_soqs))
 
         fsoqs = _map_soqs(self.final_soqs(), soq_map)
         return bb.finalize(**fsoqs)
@@ -363,7 +414,7 @@ class CompositeBloq(Bloq):
         # pylint: disable=protected-access
         bb._i = max(binst.i for binst in self.bloq_instances) + 1
 
-        soq_map: List[Tuple[SoquetT, SoquetT]] = []
+        soq_map: Dict[Soquet, Soquet] = {}
         new_out_soqs: Tuple[SoquetT, ...]
         did_work = False
         for binst, in_soqs, old_out_soqs in self.iter_bloqsoqs():
@@ -382,7 +433,7 @@ class CompositeBloq(Bloq):
                 # pylint: disable=protected-access
                 new_out_soqs = tuple(soq for _, soq in bb._add_binst(binst, in_soqs=in_soqs))
 
-            soq_map.extend(zip(old_out_soqs, new_out_soqs))
+            _update_soq_map(soq_map, zip(old_out_soqs, new_out_soqs))
 
         if not did_work:
             raise DidNotFlattenAnythingError()
@@ -409,16 +460,64 @@ class CompositeBloq(Bloq):
             A new composite bloq where all recursive subbloqs matching `pred` have been
             decomposed and flattened.
         """
-        cbloq = self
-        for _ in range(max_depth):
-            try:
-                cbloq = cbloq.flatten_once(pred)
-            except DidNotFlattenAnythingError:
-                break
-        else:
+        # Unlike repeated calls to `flatten_once`, we recurse into each decomposition as
+        # it is encountered and add the leaf bloqs to a single `BloqBuilder`, so only the
+        # final composite bloq is constructed.
+        if max_depth <= 0:
             raise ValueError("Max recursion depth exceeded in `flatten`.")
+        if len(self.bloq_instances) == 0:
+            return self
 
-        return cbloq
+        bb, _ = BloqBuilder.from_signature(self.signature)
+        # As in `flatten_once`, we preserve the `binst.i` of top-level bloq instances that are
+        # not flattened by starting the bloq builder's counter above the existing maximum.
+        # pylint: disable=protected-access
+        bb._i = max(binst.i for binst in self.bloq_instances) + 1
+        did_work = False
+
+        def _add_flattened(
+            cbloq: 'CompositeBloq', soq_map: Dict[Soquet, Soquet], depth: int
+        ) -> Dict[str, SoquetT]:
+            nonlocal did_work
+            new_out_soqs: Tuple[SoquetT, ...]
+            for binst, in_soqs, old_out_soqs in cbloq.iter_bloqsoqs():
+                in_soqs = _map_soqs(in_soqs, soq_map)
+                sub_cbloq = None
+                if pred(binst):
+                    try:
+                        sub_cbloq = binst.bloq.decompose_bloq()
+                    except (DecomposeTypeError, DecomposeNotImplementedError):
+                        pass
+
+                if sub_cbloq is not None:
+                    if depth + 1 >= max_depth:
+                        raise ValueError("Max recursion depth exceeded in `flatten`.")
+                    did_work = True
+                    sub_soq_map = _update_soq_map(
+                        {},
+                        (
+                            (_reg_to_soq(LeftDangle, reg), in_soqs[reg.name])
+                            for reg in sub_cbloq.signature.lefts()
+                        ),
+                    )
+                    sub_fsoqs = _add_flattened(sub_cbloq, sub_soq_map, depth + 1)
+                    new_out_soqs = tuple(
+                        sub_fsoqs[reg.name] for reg in sub_cbloq.signature.rights()
+                    )
+                elif depth == 0:
+                    # It is safe to re-use the top-level `binst.i`, see above.
+                    new_out_soqs = tuple(soq for _, soq in bb._add_binst(binst, in_soqs=in_soqs))
+                else:
+                    new_out_soqs = bb.add_t(binst.bloq, **in_soqs)
+
+                _update_soq_map(soq_map, zip(old_out_soqs, new_out_soqs))
+
+            return _map_soqs(cbloq.final_soqs(), soq_map)
+
+        fsoqs = _add_flattened(self, {}, depth=0)
+        if not did_work:
+            return self
+        return bb.finalize(**fsoqs)
 
     def adjoint(self) -> 'CompositeBloq':
         """Get a composite bloq which is the adjoint of this composite bloq.
@@ -430,11 +529,10 @@ class CompositeBloq(Bloq):
 
         return _adjoint_cbloq(self)
 
-    @staticmethod
-    def _debug_binst(g: nx.DiGraph, binst: BloqInstance) -> List[str]:
+    def _debug_binst(self, binst: BloqInstance) -> List[str]:
         """Helper method used in `debug_text`"""
         lines = [f'{binst}']
-        pred_cxns, succ_cxns = _binst_to_cxns(binst, binst_graph=g)
+        pred_cxns, succ_cxns = self._binst_cxns[binst]
         for pred_cxn in pred_cxns:
             lines.append(
                 f'  {pred_cxn.left.binst}.{pred_cxn.left.pretty()} -> {pred_cxn.right.pretty()}'
@@ -454,15 +552,19 @@ class CompositeBloq(Bloq):
         connections are represented twice: once as the output of a binst and again as the input
         to a subsequent binst.
         """
-        g = self._binst_graph
+        return self._debug_text
+
+    @cached_property
+    def _debug_text(self) -> str:
+        """A cached version of `debug_text()`; composite bloqs are immutable."""
         gen_texts = []
-        for gen in nx.topological_generations(g):
+        for gen in self._binst_generations:
             gen_lines = []
             for binst in gen:
                 if isinstance(binst, DanglingT):
                     continue
 
-                gen_lines.extend(self._debug_binst(g, binst))
+                gen_lines.extend(self._debug_binst(binst))
 
             if gen_lines:
                 gen_texts.append('\n'.join(gen_lines))
@@ -484,14 +586,23 @@ def _create_binst_graph(
         1. Our nodes are now BloqInstances because they are the objects to time-order. Soquet
            connections are added as edge attributes.
         2. We use networkx so we can use their algorithms for topological sorting.
+
+    The connections are first grouped by `(left binst, right binst)` edge in a plain
+    (insertion-ordered) dictionary, and the networkx graph is then built in a single
+    `add_edges_from` call. This avoids a networkx edge lookup for every connection.
     """
-    binst_graph = nx.DiGraph()
+    edge_cxns: Dict[
+        Tuple[Union[BloqInstance, DanglingT], Union[BloqInstance, DanglingT]], List[Connection]
+    ] = {}
     for cxn in cxns:
         binst_edge = (cxn.left.binst, cxn.right.binst)
-        if binst_edge in binst_graph.edges:
-            binst_graph.edges[binst_edge]['cxns'].append(cxn)
+        if binst_edge in edge_cxns:
+            edge_cxns[binst_edge].append(cxn)
         else:
-            binst_graph.add_edge(*binst_edge, cxns=[cxn])
+            edge_cxns[binst_edge] = [cxn]
+
+    binst_graph = nx.DiGraph()
+    binst_graph.add_edges_from((u, v, {'cxns': cxns}) for (u, v), cxns in edge_cxns.items())
     binst_graph.add_nodes_from(nodes)
     return binst_graph
 
@@ -655,6 +766,9 @@ class _IgnoreAvailable:
     def add(self, x: Hashable):
         pass
 
+    def update(self, xs: Iterable[Hashable]):
+        pass
+
 
 def _reg_to_soq(
     binst: Union[BloqInstance, DanglingT],
@@ -676,11 +790,12 @@ def _reg_to_soq(
         registers, the value will be a `Soquet` object.
     """
     if reg.shape:
+        # `all_idxs` iterates in C order, so the flat list of soquets can be written
+        # straight into a flat view of the array.
+        flat_soqs = [Soquet(binst, reg, idx=ri) for ri in reg.all_idxs()]
         soqs = np.empty(reg.shape, dtype=object)
-        for ri in reg.all_idxs():
-            soq = Soquet(binst, reg, idx=ri)
-            soqs[ri] = soq
-            available.add(soq)
+        soqs.reshape(-1)[:] = flat_soqs
+        available.update(flat_soqs)
         return soqs
 
     # Annoyingly, this must be a special case.
@@ -744,8 +859,34 @@ def _process_soquets(
         raise BloqError(f"{debug_str} does not accept Soquets: {unchecked_names}.") from None
 
 
+def _update_soq_map(
+    flat_soq_map: Dict[Soquet, Soquet], soq_map: Iterable[Tuple[SoquetT, SoquetT]]
+) -> Dict[Soquet, Soquet]:
+    """Add (old_soq, new_soq) pairs to a flat soquet mapping, flattening any numpy arrays.
+
+    Callers that map soquets repeatedly (e.g. while iterating `iter_bloqsoqs`) can keep
+    one flat dictionary up to date with this function instead of re-flattening a growing
+    list of tuples on every call to `_map_soqs`.
+
+    Returns:
+        `flat_soq_map`, which is updated in-place.
+    """
+    for old_soqs, new_soqs in soq_map:
+        if isinstance(old_soqs, Soquet):
+            assert isinstance(new_soqs, Soquet), new_soqs
+            flat_soq_map[old_soqs] = new_soqs
+            continue
+
+        assert isinstance(old_soqs, np.ndarray), old_soqs
+        assert isinstance(new_soqs, np.ndarray), new_soqs
+        assert old_soqs.shape == new_soqs.shape, (old_soqs.shape, new_soqs.shape)
+        flat_soq_map.update(zip(old_soqs.reshape(-1), new_soqs.reshape(-1)))
+    return flat_soq_map
+
+
 def _map_soqs(
-    soqs: Dict[str, SoquetT], soq_map: Iterable[Tuple[SoquetT, SoquetT]]
+    soqs: Dict[str, SoquetT],
+    soq_map: Union[Dict[Soquet, Soquet], Iterable[Tuple[SoquetT, SoquetT]]],
 ) -> Dict[str, SoquetT]:
     """Map `soqs` according to `soq_map`.
 
@@ -755,27 +896,20 @@ def _map_soqs(
     Args:
         soqs: A soquet dictionary mapping register names to Soquets or arrays
             of Soquets. The values of this dictionary will be mapped.
-        soq_map: An iterable of (old_soq, new_soq) tuples that inform how to
-            perform the mapping. Note that this is a list of tuples (not a dictionary)
-            because `old_soq` may be an unhashable numpy array of Soquet.
+        soq_map: Either a flat dictionary from old `Soquet` to new `Soquet` (see
+            `_update_soq_map`) or an iterable of (old_soq, new_soq) tuples that inform how to
+            perform the mapping. In the latter case, `old_soq` may be an unhashable numpy
+            array of Soquet.
 
     Returns:
         A mapped version of `soqs`.
     """
 
     # First: flatten out any numpy arrays
-    flat_soq_map: Dict[Soquet, Soquet] = {}
-    for old_soqs, new_soqs in soq_map:
-        if isinstance(old_soqs, Soquet):
-            assert isinstance(new_soqs, Soquet), new_soqs
-            flat_soq_map[old_soqs] = new_soqs
-            continue
-
-        assert isinstance(old_soqs, np.ndarray), old_soqs
-        assert isinstance(new_soqs, np.ndarray), new_soqs
-        assert old_soqs.shape == new_soqs.shape, (old_soqs.shape, new_soqs.shape)
-        for o, n in zip(old_soqs.reshape(-1), new_soqs.reshape(-1)):
-            flat_soq_map[o] = n
+    if isinstance(soq_map, dict):
+        flat_soq_map = soq_map
+    else:
+        flat_soq_map = _update_soq_map({}, soq_map)
 
     # Then use vectorize to use the flat mapping.
     def _map_soq(soq: Soquet) -> Soquet:
@@ -936,7 +1070,8 @@ class BloqBuilder:
 
     @staticmethod
     def map_soqs(
-        soqs: Dict[str, SoquetT], soq_map: Iterable[Tuple[SoquetT, SoquetT]]
+        soqs: Dict[str, SoquetT],
+        soq_map: Union[Dict[Soquet, Soquet], Iterable[Tuple[SoquetT, SoquetT]]],
     ) -> Dict[str, SoquetT]:
         """Map `soqs` according to `soq_map`.
 
@@ -945,9 +1080,10 @@ class BloqBuilder:
         Args:
             soqs: A soquet dictionary mapping register names to Soquets or arrays
                 of Soquets. The values of this dictionary will be mapped.
-            soq_map: An iterable of (old_soq, new_soq) tuples that inform how to
-                perform the mapping. Note that this is a list of tuples (not a dictionary)
-                because `old_soq` may be an unhashable numpy array of Soquet.
+            soq_map: Either a flat dictionary from old `Soquet` to new `Soquet` (see
+                `_update_soq_map`) or an iterable of (old_soq, new_soq) tuples that inform how
+                to perform the mapping. In the latter case, `old_soq` may be an unhashable
+                numpy array of Soquet.
 
         Returns:
             A mapped version of `soqs`.
@@ -1131,15 +1267,18 @@ class BloqBuilder:
                 in_soqs[k] = np.asarray(v)
 
         # Initial mapping of LeftDangle according to user-provided in_soqs.
-        soq_map: List[Tuple[SoquetT, SoquetT]] = [
-            (_reg_to_soq(LeftDangle, reg), cast(SoquetT, in_soqs[reg.name]))
-            for reg in cbloq.signature.lefts()
-        ]
+        soq_map = _update_soq_map(
+            {},
+            (
+                (_reg_to_soq(LeftDangle, reg), cast(SoquetT, in_soqs[reg.name]))
+                for reg in cbloq.signature.lefts()
+            ),
+        )
 
         for binst, in_soqs, old_out_soqs in cbloq.iter_bloqsoqs():
             in_soqs = _map_soqs(in_soqs, soq_map)
             new_out_soqs = self.add_t(binst.bloq, **in_soqs)
-            soq_map.extend(zip(old_out_soqs, new_out_soqs))
+            _update_soq_map(soq_map, zip(old_out_soqs, new_out_soqs))
 
         fsoqs = _map_soqs(cbloq.final_soqs(), soq_map)
         return tuple(fsoqs[reg.name] for reg in cbloq.signature.rights())
@@ -1176,10 +1315,11 @@ class BloqBuilder:
                 name=name, dtype=soq.reshape(-1)[0].reg.dtype, shape=soq.shape, side=Side.RIGHT
             )
 
-        right_reg_names = [reg.name for reg in self._regs if reg.side & Side.RIGHT]
-        for name, soq in final_soqs.items():
-            if name not in right_reg_names:
-                self._regs.append(_infer_reg(name, soq))
+        right_reg_names = {reg.name for reg in self._regs if reg.side & Side.RIGHT}
+        if not right_reg_names.issuperset(final_soqs):
+            for name, soq in final_soqs.items():
+                if name not in right_reg_names:
+                    self._regs.append(_infer_reg(name, soq))
 
         return self._finalize_strict(**final_soqs)
 
@@ -1238,7 +1378,7 @@ class BloqBuilder:
         from qualtran.bloqs.bookkeeping import Join
 
         try:
-            soqs = np.asarray(soqs)
+            soqs = np.asarray(soqs, dtype=object)
             (n,) = soqs.shape
         except (AttributeError, ValueError):
             raise ValueError("`join` expects a 1-d array of input soquets to join.") from None
@@ -22,7 +22,7 @@ if TYPE_CHECKING:
     from qualtran import Bloq, Register
 
 
-@frozen
+@frozen(cache_hash=True)
 class BloqInstance:
     """A unique instance of a Bloq within a `CompositeBloq`.
 
@@ -78,7 +78,7 @@ def _to_tuple(x: Union[int, Tuple[int, ...]]) -> Tuple[int, ...]:
     return x
 
 
-@frozen
+@frozen(cache_hash=True)
 class Soquet:
     """One half of a connection.
 
@@ -132,7 +132,7 @@ def _singleton_error(self, x):
 DanglingT.__init__ = _singleton_error  # type: ignore[method-assign]
 
 
-@frozen
+@frozen(cache_hash=True)
 class Connection:
     """A connection between two `Soquet`s.
 
@@ -12,7 +12,6 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from functools import cached_property
 from typing import Dict, List, Optional, TYPE_CHECKING
 
 import attrs
@@ -33,6 +32,11 @@ if TYPE_CHECKING:
     import quimb.tensor as qtn
 
 
+# These bloqs are constructed many times in tests; share one signature per register layout.
+_ONE_BIT_SIGNATURE = Signature.build(q=1)
+_TWO_BIT_SIGNATURE = Signature.build(ctrl=1, target=1)
+
+
 @frozen(repr=False)
 class TestAtom(Bloq):
     """An atomic bloq useful for generic testing and demonstration.
@@ -46,9 +50,9 @@ class TestAtom(Bloq):
 
     tag: Optional[str] = None
 
-    @cached_property
+    @property
     def signature(self) -> Signature:
-        return Signature.build(q=1)
+        return _ONE_BIT_SIGNATURE
 
     def decompose_bloq(self) -> 'CompositeBloq':
         raise DecomposeTypeError(f"{self} is atomic")
@@ -85,9 +89,9 @@ class TestAtom(Bloq):
 
 @frozen
 class TestTwoBitOp(Bloq):
-    @cached_property
+    @property
     def signature(self) -> Signature:
-        return Signature.build(ctrl=1, target=1)
+        return _TWO_BIT_SIGNATURE
 
     def decompose_bloq(self) -> 'CompositeBloq':
         raise DecomposeTypeError(f"{self} is atomic")
@@ -130,9 +134,9 @@ class TestGWRAtom(GateWithRegisters):
     tag: Optional[str] = None
     is_adjoint: bool = False
 
-    @cached_property
+    @property
     def signature(self) -> Signature:
-        return Signature.build(q=1)
+        return _ONE_BIT_SIGNATURE
 
     def decompose_bloq(self) -> 'CompositeBloq':
         raise DecomposeTypeError(f"{self} is atomic")
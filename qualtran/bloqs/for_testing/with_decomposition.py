@@ -12,7 +12,6 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from functools import cached_property
 from typing import Dict, TYPE_CHECKING
 
 from attrs import frozen
@@ -24,13 +23,18 @@ if TYPE_CHECKING:
     from qualtran import SoquetT
 
 
+_SERIAL_COMBO_SIGNATURE = Signature.build(reg=1)
+_PARALLEL_COMBO_SIGNATURE = Signature.build(reg=3)
+_EMPTY_SIGNATURE = Signature.build()
+
+
 @frozen
 class TestSerialCombo(Bloq):
     """Made up of three bloqs in serial order."""
 
-    @cached_property
+    @property
     def signature(self) -> Signature:
-        return Signature.build(reg=1)
+        return _SERIAL_COMBO_SIGNATURE
 
     def build_composite_bloq(self, bb: 'BloqBuilder', reg: 'SoquetT') -> Dict[str, 'SoquetT']:
         for i in range(3):
@@ -42,9 +46,9 @@ class TestSerialCombo(Bloq):
 class TestParallelCombo(Bloq):
     """Made up of three bloqs that happen in parallel."""
 
-    @cached_property
+    @property
     def signature(self) -> Signature:
-        return Signature.build(reg=3)
+        return _PARALLEL_COMBO_SIGNATURE
 
     def build_composite_bloq(self, bb: 'BloqBuilder', reg: 'SoquetT') -> Dict[str, 'SoquetT']:
         assert isinstance(reg, Soquet)
@@ -59,9 +63,9 @@ class TestParallelCombo(Bloq):
 class TestIndependentParallelCombo(Bloq):
     """Made up of three independent alloc/bloq/free lines."""
 
-    @cached_property
+    @property
     def signature(self) -> Signature:
-        return Signature.build()
+        return _EMPTY_SIGNATURE
 
     def build_composite_bloq(self, bb: 'BloqBuilder', **soqs: 'SoquetT') -> Dict[str, 'SoquetT']:
         for _ in range(3):
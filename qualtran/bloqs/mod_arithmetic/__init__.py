@@ -12,7 +12,55 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from .mod_addition import CModAdd, CModAddK, CtrlScaleModAdd, ModAdd, ModAddK
-from .mod_division import KaliskiModInverse
-from .mod_multiplication import CModMulK, DirtyOutOfPlaceMontgomeryModMul, ModDbl
-from .mod_subtraction import CModNeg, CModSub, ModNeg, ModSub
+"""Modular arithmetic bloqs.
+
+The bloq classes are imported lazily (PEP 562) so that importing this package only loads
+the submodule that defines the requested symbol.
+"""
+
+import importlib
+from typing import Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .mod_addition import CModAdd, CModAddK, CtrlScaleModAdd, ModAdd, ModAddK
+    from .mod_division import KaliskiModInverse
+    from .mod_multiplication import CModMulK, DirtyOutOfPlaceMontgomeryModMul, ModDbl
+    from .mod_subtraction import CModNeg, CModSub, ModNeg, ModSub
+
+_LAZY_ATTRS = {
+    'CModAdd': '.mod_addition',
+    'CModAddK': '.mod_addition',
+    'CtrlScaleModAdd': '.mod_addition',
+    'ModAdd': '.mod_addition',
+    'ModAddK': '.mod_addition',
+    'KaliskiModInverse': '.mod_division',
+    'CModMulK': '.mod_multiplication',
+    'DirtyOutOfPlaceMontgomeryModMul': '.mod_multiplication',
+    'ModDbl': '.mod_multiplication',
+    'CModNeg': '.mod_subtraction',
+    'CModSub': '.mod_subtraction',
+    'ModNeg': '.mod_subtraction',
+    'ModSub': '.mod_subtraction',
+}
+
+_SUBMODULES = frozenset(module_name[1:] for module_name in _LAZY_ATTRS.values())
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        # Importing a submodule also binds it as an attribute of this package.
+        return importlib.import_module(f'.{name}', __name__)
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    val = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = val
+    return val
+
+
+def __dir__() -> List[str]:
+    dunders = {name for name in globals() if name.startswith('__')}
+    return sorted(dunders | _SUBMODULES | set(__all__))
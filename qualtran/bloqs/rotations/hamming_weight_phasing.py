@@ -14,24 +14,34 @@
 
 from functools import cached_property
 from typing import Dict, Optional, Tuple, TYPE_CHECKING
-from collections import Counter
 
 import attrs
 import numpy as np
 
-from qualtran import bloq_example, BloqDocSpec, GateWithRegisters, QFxp, QUInt, Register, Signature, Bloq
+from qualtran import (
+    Bloq,
+    bloq_example,
+    BloqDocSpec,
+    GateWithRegisters,
+    QBit,
+    QFxp,
+    QUInt,
+    Register,
+    Signature,
+)
 from qualtran.bloqs.arithmetic import HammingWeightCompute
 from qualtran.bloqs.basic_gates import ZPowGate
+from qualtran.bloqs.bookkeeping import Partition
 from qualtran.bloqs.rotations.quantum_variable_rotation import QvrPhaseGradient
 from qualtran.drawing import Text, WireSymbol
-from qualtran.symbolics import SymbolicFloat, SymbolicInt
+from qualtran.symbolics import is_symbolic, SymbolicFloat, SymbolicInt
 
 if TYPE_CHECKING:
     from qualtran import BloqBuilder, SoquetT
     from qualtran.resource_counting import BloqCountDictT, SympySymbolAllocator
 
 
-@attrs.frozen
+@attrs.frozen(cache_hash=True)
 class HammingWeightPhasing(GateWithRegisters):
     r"""Applies $Z^{\text{exponent}}$ to every qubit of an input register of size `bitsize`.
 
@@ -82,16 +92,20 @@ class HammingWeightPhasing(GateWithRegisters):
         return Signature.build_from_dtypes(x=QUInt(self.bitsize))
 
     def build_composite_bloq(self, bb: 'BloqBuilder', **soqs: 'SoquetT') -> Dict[str, 'SoquetT']:
-        soqs['x'], junk, out = bb.add(HammingWeightCompute(self.bitsize), x=soqs['x'])
+        hwc = HammingWeightCompute(self.bitsize)
+        soqs['x'], junk, out = bb.add(hwc, x=soqs['x'])
         out = bb.split(out)
-        for i in range(len(out)):
-            out[-(i + 1)] = bb.add(
-                ZPowGate(exponent=(2**i) * self.exponent, eps=self.eps / len(out)), q=out[-(i + 1)]
-            )
-        out = bb.join(out, dtype=QUInt(self.bitsize.bit_length()))
-        soqs['x'] = bb.add(
-            HammingWeightCompute(self.bitsize).adjoint(), x=soqs['x'], junk=junk, out=out
-        )
+        n = len(out)
+        eps_per = self.eps / n
+        if is_symbolic(self.exponent):
+            exponents = [(2**i) * self.exponent for i in range(n)]
+        else:
+            exponents = np.ldexp(self.exponent, np.arange(n)).tolist()
+        gates = [ZPowGate(exponent=exponent, eps=eps_per) for exponent in exponents]
+        for i, gate in enumerate(gates):
+            out[-(i + 1)] = bb.add(gate, q=out[-(i + 1)])
+        out = bb.join(out, dtype=QUInt(n))
+        soqs['x'] = bb.add(hwc.adjoint(), x=soqs['x'], junk=junk, out=out)
         return soqs
 
     def wire_symbol(self, reg: Optional[Register], idx: Tuple[int, ...] = tuple()) -> 'WireSymbol':
@@ -99,14 +113,14 @@ class HammingWeightPhasing(GateWithRegisters):
             return Text(f'HWP_{self.bitsize}(Z^{self.exponent})')
         return super().wire_symbol(reg, idx)
 
+    @cached_property
+    def _callee_counts(self) -> 'BloqCountDictT':
+        hwc = HammingWeightCompute(self.bitsize)
+        n = self.bitsize.bit_length()
+        return {hwc: 1, hwc.adjoint(): 1, ZPowGate(exponent=self.exponent, eps=self.eps / n): n}
+
     def build_call_graph(self, ssa: 'SympySymbolAllocator') -> 'BloqCountDictT':
-        return {
-            HammingWeightCompute(self.bitsize): 1,
-            HammingWeightCompute(self.bitsize).adjoint(): 1,
-            ZPowGate(
-                exponent=self.exponent, eps=self.eps / self.bitsize.bit_length()
-            ): self.bitsize.bit_length(),
-        }
+        return dict(self._callee_counts)
 
 
 @bloq_example
@@ -121,7 +135,7 @@ _HAMMING_WEIGHT_PHASING_DOC = BloqDocSpec(
 )
 
 
-@attrs.frozen
+@attrs.frozen(cache_hash=True)
 class HammingWeightPhasingViaPhaseGradient(GateWithRegisters):
     r"""Applies $Z^{\text{exponent}}$ to every qubit of an input register of size `bitsize`.
 
@@ -188,9 +202,10 @@ class HammingWeightPhasingViaPhaseGradient(GateWithRegisters):
     def build_composite_bloq(
         self, bb: 'BloqBuilder', *, x: 'SoquetT', phase_grad: 'SoquetT'
     ) -> Dict[str, 'SoquetT']:
-        x, junk, out = bb.add(HammingWeightCompute(self.bitsize), x=x)
+        hwc = HammingWeightCompute(self.bitsize)
+        x, junk, out = bb.add(hwc, x=x)
         out, phase_grad = bb.add(self.phase_oracle, out=out, phase_grad=phase_grad)
-        x = bb.add(HammingWeightCompute(self.bitsize).adjoint(), x=x, junk=junk, out=out)
+        x = bb.add(hwc.adjoint(), x=x, junk=junk, out=out)
         return {'x': x, 'phase_grad': phase_grad}
 
     def wire_symbol(self, reg: Optional[Register], idx: Tuple[int, ...] = tuple()) -> 'WireSymbol':
@@ -212,7 +227,7 @@ _HAMMING_WEIGHT_PHASING_VIA_PHASE_GRADIENT_DOC = BloqDocSpec(
 )
 
 
-@attrs.frozen
+@attrs.frozen(cache_hash=True)
 class HammingWeightPhasingWithConfigurableAncilla(Bloq):
     r""""Applies $Z^{\text{exponent}}$ to every qubit of an input register of size `bitsize`.
 
@@ -246,10 +261,40 @@ class HammingWeightPhasingWithConfigurableAncilla(Bloq):
         return Signature.build_from_dtypes(x=QUInt(self.bitsize))
 
     def __attrs_post_init__(self):
+        if is_symbolic(self.bitsize, self.ancillasize):
+            return
         if self.ancillasize >= self.bitsize - 1:
             raise ValueError('ancillasize should be less than bitsize - 1.')
 
     
+    @cached_property
+    def _num_iters_and_remainder(self) -> Tuple[SymbolicInt, SymbolicInt]:
+        """Number of full `ancillasize + 1` sized chunks of `x`, and the size of the leftover."""
+        stride = self.ancillasize + 1
+        if isinstance(stride, int) and isinstance(self.bitsize, int) and stride & (stride - 1) == 0:
+            return self.bitsize >> (stride.bit_length() - 1), self.bitsize & (stride - 1)
+        return divmod(self.bitsize, stride)
+
+    @cached_property
+    def _chunk_plan(self) -> Tuple[Partition, HammingWeightPhasing, Optional[Bloq]]:
+        """Decomposition plan: the `Partition` of `x`, the chunk bloq and the remainder bloq.
+
+        `x` is partitioned into a `chunks` register of shape `(num_iters,)` holding
+        `ancillasize + 1` qubit chunks, followed by a `rem` register for the remainder, if any.
+        """
+        stride = self.ancillasize + 1
+        num_iters, remainder = self._num_iters_and_remainder
+        regs = [Register('chunks', QUInt(stride), shape=(num_iters,))]
+        rem_bloq: Optional[Bloq] = None
+        if remainder > 1:
+            regs.append(Register('rem', QUInt(remainder)))
+            rem_bloq = HammingWeightPhasing(bitsize=remainder, exponent=self.exponent, eps=self.eps)
+        elif remainder == 1:
+            regs.append(Register('rem', QBit()))
+            rem_bloq = ZPowGate(exponent=self.exponent, eps=self.eps)
+        hwp = HammingWeightPhasing(bitsize=stride, exponent=self.exponent, eps=self.eps)
+        return Partition(self.bitsize, tuple(regs)), hwp, rem_bloq
+
     def build_composite_bloq(self, bb: 'BloqBuilder', *, x: 'SoquetT') -> Dict[str, 'SoquetT']:
         '''
         General strategy: find the max-bitsize number (n bits) we can compute the HW of using our available ancilla,
@@ -257,23 +302,16 @@ class HammingWeightPhasingWithConfigurableAncilla(Bloq):
         rotations, and so on until we have computed the HW of the entire input. Can express this as repeated calls to
         HammingWeightPhasing bloqs on subsets of the input.
         '''
-        num_iters = self.bitsize // (self.ancillasize + 1)
-        remainder = self.bitsize % (self.ancillasize+1)
-        x = bb.split(x)
-        x_parts = []
+        num_iters, remainder = self._num_iters_and_remainder
+        partition, hwp, rem_bloq = self._chunk_plan
+        parts = bb.add_d(partition, x=x)
+        chunks = parts['chunks']
         for i in range(num_iters):
-            x_part = bb.join(x[i*(self.ancillasize+1):(i+1)*(self.ancillasize+1)], dtype=QUInt(self.ancillasize+1))
-            x_part = bb.add(HammingWeightPhasing(bitsize=self.ancillasize+1, exponent=self.exponent, eps=self.eps), x=x_part)
-            x_parts.extend(bb.split(x_part))
-        if remainder > 1:
-            x_part = bb.join(x[(-1*remainder):], dtype=QUInt(remainder))
-            x_part = bb.add(HammingWeightPhasing(bitsize=remainder, exponent=self.exponent, eps=self.eps), x=x_part)
-            x_parts.extend(bb.split(x_part))
-        if remainder == 1:
-            x_part = x[-1]
-            x_part = bb.add(ZPowGate(exponent=self.exponent, eps=self.eps), q=x_part)
-            x_parts.append(x_part)
-        x = bb.join(np.array(x_parts), dtype=QUInt(self.bitsize))
+            chunks[i] = bb.add(hwp, x=chunks[i])
+        if rem_bloq is not None:
+            (rem_reg,) = rem_bloq.signature
+            parts['rem'] = bb.add(rem_bloq, **{rem_reg.name: parts['rem']})
+        x = bb.add(partition.adjoint(), **parts)
         return {'x': x}
 
 
@@ -283,20 +321,24 @@ class HammingWeightPhasingWithConfigurableAncilla(Bloq):
         return super().wire_symbol(reg, idx)
 
 
-    def build_call_graph(self, ssa: 'SympySymbolAllocator') -> 'BloqCountDictT':
-        num_iters = self.bitsize // (self.ancillasize + 1)
-        remainder = self.bitsize - (self.ancillasize + 1) * num_iters
-
-        counts = Counter[Bloq]()
-        counts[HammingWeightPhasing(self.ancillasize+1, self.exponent, self.eps)] += num_iters
-        
-        if remainder > 1:
-            counts[HammingWeightPhasing(remainder, self.exponent, self.eps)] += 1
+    @cached_property
+    def _callee_counts(self) -> 'BloqCountDictT':
+        stride = self.ancillasize + 1
+        num_iters, remainder = self._num_iters_and_remainder
+
+        hwp = HammingWeightPhasing(stride, self.exponent, self.eps)
+        counts: 'BloqCountDictT' = {hwp: num_iters}
+        if is_symbolic(remainder) or remainder > 1:
+            # A symbolic remainder is counted as one more (possibly smaller) chunk.
+            counts[HammingWeightPhasing(remainder, self.exponent, self.eps)] = 1
         elif remainder:
-            counts[ZPowGate(exponent=self.exponent, eps=self.eps)] += 1
+            counts[ZPowGate(exponent=self.exponent, eps=self.eps)] = 1
 
         return counts
 
+    def build_call_graph(self, ssa: 'SympySymbolAllocator') -> 'BloqCountDictT':
+        return dict(self._callee_counts)
+
 
 @bloq_example
 def _hamming_weight_phasing_with_configurable_ancilla() -> HammingWeightPhasingWithConfigurableAncilla:
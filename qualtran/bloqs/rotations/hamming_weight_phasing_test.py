@@ -17,9 +17,11 @@ import attrs
 import cirq
 import numpy as np
 import pytest
+import sympy
 
 import qualtran.testing as qlt_testing
 from qualtran import GateWithRegisters, Signature
+from qualtran.bloqs.bookkeeping import Partition
 from qualtran.bloqs.rotations.hamming_weight_phasing import (
     HammingWeightPhasing,
     HammingWeightPhasingViaPhaseGradient,
@@ -30,12 +32,14 @@ from qualtran.cirq_interop.testing import GateHelper
 from qualtran.resource_counting.generalizers import (
     cirq_to_bloqs,
     generalize_rotation_angle,
+    ignore_cliffords,
     ignore_split_join,
 )
 from qualtran.resource_counting import (
     QECGatesCost, 
     GateCounts, 
     get_cost_value,
+    SympySymbolAllocator,
 )
 
 from qualtran.symbolics import SymbolicInt
@@ -78,6 +82,28 @@ def test_hamming_weight_phasing_large(n: int):
     assert gate.t_complexity().t == 4 * (n - n.bit_count())
 
 
+def test_hamming_weight_phasing_generalized_costs():
+    gc = get_cost_value(HammingWeightPhasing(7, 0.1), QECGatesCost(), generalizer=ignore_cliffords)
+    assert gc == GateCounts(and_bloq=4, clifford=4, rotation=3, measurement=4)
+
+    gc = get_cost_value(
+        HammingWeightPhasing(7, 1 / 4), QECGatesCost(), generalizer=generalize_rotation_angle
+    )
+    assert gc.t == 0
+    assert gc.rotation == 3
+
+
+@pytest.mark.parametrize(
+    'bloq',
+    [HammingWeightPhasing(7, 0.1), HammingWeightPhasingWithConfigurableAncilla(7, 2, 0.1)],
+)
+def test_hamming_weight_phasing_call_graph_returns_fresh_dict(bloq):
+    counts = bloq.build_call_graph(SympySymbolAllocator())
+    expected = dict(counts)
+    counts.clear()
+    assert bloq.build_call_graph(SympySymbolAllocator()) == expected
+
+
 @attrs.frozen
 class TestHammingWeightPhasingViaPhaseGradient(GateWithRegisters):
     bitsize: int
@@ -170,3 +196,30 @@ def test_hamming_weight_phasing_with_configurable_ancilla_bloq_counts(n: int, an
     gc = get_cost_value(gate, QECGatesCost())
     assert gc.rotation <= (-(-n // (ancillasize+1))) * (ancillasize+1).bit_length() + remainder.bit_length()
     assert gc.toffoli + gc.and_bloq + gc.cswap <= ancillasize * -(-n // (ancillasize+1))
+
+
+def test_hamming_weight_phasing_with_configurable_ancilla_validation():
+    with pytest.raises(ValueError):
+        HammingWeightPhasingWithConfigurableAncilla(4, 3)
+    n, r = sympy.symbols('n r', positive=True, integer=True)
+    gate = HammingWeightPhasingWithConfigurableAncilla(n, r)
+    assert gate.signature.n_qubits() == n
+    assert gate.build_call_graph(SympySymbolAllocator()) == {
+        HammingWeightPhasing(r + 1): sympy.floor(n / (r + 1)),
+        HammingWeightPhasing(sympy.Mod(n, r + 1)): 1,
+    }
+
+
+def test_hamming_weight_phasing_equal_bloqs_decompose_equal():
+    a = HammingWeightPhasingWithConfigurableAncilla(7, 2, 1 / 10)
+    b = HammingWeightPhasingWithConfigurableAncilla(7, 2, 1 / 10)
+    assert a == b and hash(a) == hash(b)
+    assert a != HammingWeightPhasingWithConfigurableAncilla(7, 1, 1 / 10)
+
+    def phasing_bloqs(bloq):
+        binsts = sorted(bloq.decompose_bloq().bloq_instances, key=lambda binst: binst.i)
+        return [binst.bloq for binst in binsts if not isinstance(binst.bloq, Partition)]
+
+    bloqs_a, bloqs_b = phasing_bloqs(a), phasing_bloqs(b)
+    assert len(bloqs_a) == len(bloqs_b) == 3
+    assert bloqs_a == bloqs_b
@@ -192,6 +192,12 @@ def t_complexity(bloq: Bloq) -> TComplexity:
     Raises:
         TypeError: if none of the strategies can derive the t complexity.
     """
+    return _t_complexity_for_bloq(bloq)
+
+
+@cachetools.cached(cachetools.LRUCache(1024), info=True)
+def _t_complexity_for_bloq(bloq: Bloq) -> TComplexity:
+    """Cached helper for `t_complexity`; bloqs are immutable so their cost can be re-used."""
     from qualtran.resource_counting import get_cost_value, QECGatesCost
 
     return get_cost_value(bloq, QECGatesCost(legacy_shims=True)).to_legacy_t_complexity()
@@ -22,6 +22,7 @@ from qualtran.bloqs.basic_gates import CHadamard, GlobalPhase
 from qualtran.bloqs.mcmt.and_bloq import And
 from qualtran.cirq_interop.t_complexity_protocol import (
     _from_directly_countable_cirq,
+    _t_complexity_for_bloq,
     t_complexity,
     t_complexity_compat,
     TComplexity,
@@ -72,6 +73,14 @@ def test_t_complexity_for_bloq_does_not_support():
         _ = t_complexity(DoesNotSupportTComplexityBloq())
 
 
+def test_t_complexity_is_cached():
+    bloq = SupportsTComplexityGateWithRegisters()
+    assert t_complexity(bloq) == TComplexity(t=1, clifford=2)
+    hits = _t_complexity_for_bloq.cache_info().hits  # type: ignore[attr-defined]
+    assert t_complexity(SupportsTComplexityGateWithRegisters()) == TComplexity(t=1, clifford=2)
+    assert _t_complexity_for_bloq.cache_info().hits == hits + 1  # type: ignore[attr-defined]
+
+
 def test_t_complexity_compat():
     with pytest.raises(TypeError):
         _ = t_complexity_compat(DoesNotSupportTComplexity())
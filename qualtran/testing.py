@@ -14,11 +14,13 @@
 
 """Functions for testing bloqs."""
 
+import functools
 import itertools
 import traceback
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple, Union
+from types import CodeType
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import numpy as np
 import sympy
@@ -29,12 +31,14 @@ from qualtran import (
     BloqError,
     BloqExample,
     CompositeBloq,
+    Connection,
     DanglingT,
     DecomposeNotImplementedError,
     DecomposeTypeError,
     LeftDangle,
     RightDangle,
     Side,
+    Soquet,
 )
 from qualtran._infra.composite_bloq import _get_flat_dangling_soqs
 from qualtran._infra.data_types import check_dtypes_consistent, QDTypeCheckingSeverity
@@ -71,12 +75,21 @@ def assert_registers_match_dangling(cbloq: CompositeBloq):
     to either `LeftDangle` or `RightDangle` to indicate the soquet's status as an input
     or output, respectively.
     """
-    lefts = frozenset(_get_flat_dangling_soqs(cbloq.signature, right=False))
-    seen_lefts = set()
-    rights = frozenset(_get_flat_dangling_soqs(cbloq.signature, right=True))
-    seen_rights = set()
-
+    checker = _DanglingChecker(cbloq)
     for cxn in cbloq.connections:
+        checker.check(cxn)
+
+
+class _DanglingChecker:
+    """Per-connection state and checks for `assert_registers_match_dangling`."""
+
+    def __init__(self, cbloq: CompositeBloq):
+        self.lefts = frozenset(_get_flat_dangling_soqs(cbloq.signature, right=False))
+        self.seen_lefts: Set[Soquet] = set()
+        self.rights = frozenset(_get_flat_dangling_soqs(cbloq.signature, right=True))
+        self.seen_rights: Set[Soquet] = set()
+
+    def check(self, cxn: Connection):
         if isinstance(cxn.left.binst, DanglingT):
             if cxn.left.binst is not LeftDangle:
                 raise BloqError(
@@ -85,12 +98,12 @@ def assert_registers_match_dangling(cbloq: CompositeBloq):
                 )
 
             # cxn.left is LeftDangle
-            if cxn.left not in lefts:
+            if cxn.left not in self.lefts:
                 raise BloqError(f"{cxn}'s LeftDangle does not match the registers of the bloq.")
-            if cxn.left in seen_lefts:
+            if cxn.left in self.seen_lefts:
                 raise BloqError(f"{cxn}'s LeftDangle was already connected to something else!")
 
-            seen_lefts.add(cxn.left)
+            self.seen_lefts.add(cxn.left)
 
         if isinstance(cxn.right.binst, DanglingT):
             if cxn.right.binst is not RightDangle:
@@ -100,12 +113,12 @@ def assert_registers_match_dangling(cbloq: CompositeBloq):
                 )
 
             # cxn.right is RightDangle
-            if cxn.right not in rights:
+            if cxn.right not in self.rights:
                 raise BloqError(f"{cxn}'s RightDangle does not match the registers of the bloq.")
-            if cxn.right in seen_rights:
+            if cxn.right in self.seen_rights:
                 raise BloqError(f"{cxn}'s RightDangle was already connected to something else!")
 
-            seen_rights.add(cxn.right)
+            self.seen_rights.add(cxn.right)
 
 
 def assert_connections_compatible(cbloq: CompositeBloq):
@@ -115,35 +128,40 @@ def assert_connections_compatible(cbloq: CompositeBloq):
     used as such.
     """
     for cxn in cbloq.connections:
-        lr = cxn.left.reg
-        rr = cxn.right.reg
+        _check_connection_compatible(cxn)
 
-        if not is_symbolic(lr.dtype.num_qubits) and lr.dtype.num_qubits <= 0:
-            raise BloqError(f"{cxn} has an invalid number of qubits: {lr.dtype}")
-        if not is_symbolic(rr.dtype.num_qubits) and rr.dtype.num_qubits <= 0:
-            raise BloqError(f"{cxn} has an invalid number of qubits: {rr.dtype}")
 
-        if not check_dtypes_consistent(lr.dtype, rr.dtype):
-            raise BloqError(f"{cxn}'s QDTypes are incompatible: {lr.dtype} -> {rr.dtype}")
+def _check_connection_compatible(cxn: Connection):
+    """Helper for `assert_connections_compatible` that checks a single connection."""
+    lr = cxn.left.reg
+    rr = cxn.right.reg
 
-        # Check the left side of the connection relative to the `Register.side`.
-        if cxn.left.binst is LeftDangle:
-            lr_side_should_be = Side.LEFT
-        else:
-            # internal connection -- left side should be output from a RIGHT register
-            lr_side_should_be = Side.RIGHT
+    if not is_symbolic(lr.dtype.num_qubits) and lr.dtype.num_qubits <= 0:
+        raise BloqError(f"{cxn} has an invalid number of qubits: {lr.dtype}")
+    if not is_symbolic(rr.dtype.num_qubits) and rr.dtype.num_qubits <= 0:
+        raise BloqError(f"{cxn} has an invalid number of qubits: {rr.dtype}")
 
-        if not (lr.side & lr_side_should_be):
-            raise BloqError(f"{cxn}'s left side is associated with a register with side {lr.side}")
+    if not check_dtypes_consistent(lr.dtype, rr.dtype):
+        raise BloqError(f"{cxn}'s QDTypes are incompatible: {lr.dtype} -> {rr.dtype}")
 
-        # And the right side
-        if cxn.right.binst is RightDangle:
-            rr_side_should_be = Side.RIGHT
-        else:
-            # internal connection -- right side should input into a LEFT register
-            rr_side_should_be = Side.LEFT
-        if not (rr.side & rr_side_should_be):
-            raise BloqError(f"{cxn}'s right side is associated with a register with side {rr.side}")
+    # Check the left side of the connection relative to the `Register.side`.
+    if cxn.left.binst is LeftDangle:
+        lr_side_should_be = Side.LEFT
+    else:
+        # internal connection -- left side should be output from a RIGHT register
+        lr_side_should_be = Side.RIGHT
+
+    if not (lr.side & lr_side_should_be):
+        raise BloqError(f"{cxn}'s left side is associated with a register with side {lr.side}")
+
+    # And the right side
+    if cxn.right.binst is RightDangle:
+        rr_side_should_be = Side.RIGHT
+    else:
+        # internal connection -- right side should input into a LEFT register
+        rr_side_should_be = Side.LEFT
+    if not (rr.side & rr_side_should_be):
+        raise BloqError(f"{cxn}'s right side is associated with a register with side {rr.side}")
 
 
 def assert_connections_consistent_qdtypes(
@@ -173,20 +191,25 @@ def assert_soquets_belong_to_registers(cbloq: CompositeBloq):
     register actually exists on the bloq.
     """
     for soq in cbloq.all_soquets:
-        reg = soq.reg
+        _check_soquet_belongs_to_register(soq)
 
-        if len(soq.idx) != len(reg.shape):
-            raise BloqError(f"{soq} has an idx of the wrong shape for {reg}")
 
-        for soq_i, reg_max in zip(soq.idx, reg.shape):
-            if soq_i >= reg_max:
-                raise BloqError(f"{soq}'s index exceeds the bounds provided by {reg}'s shape.")
+def _check_soquet_belongs_to_register(soq: Soquet):
+    """Helper for `assert_soquets_belong_to_registers` that checks a single soquet."""
+    reg = soq.reg
 
-        if isinstance(soq.binst, DanglingT):
-            continue
+    if len(soq.idx) != len(reg.shape):
+        raise BloqError(f"{soq} has an idx of the wrong shape for {reg}")
+
+    for soq_i, reg_max in zip(soq.idx, reg.shape):
+        if soq_i >= reg_max:
+            raise BloqError(f"{soq}'s index exceeds the bounds provided by {reg}'s shape.")
+
+    if isinstance(soq.binst, DanglingT):
+        return
 
-        if soq.reg not in soq.binst.bloq.signature:
-            raise BloqError(f"{soq}'s register doesn't exist on its bloq {soq.binst.bloq}")
+    if soq.reg not in soq.binst.bloq.signature:
+        raise BloqError(f"{soq}'s register doesn't exist on its bloq {soq.binst.bloq}")
 
 
 def assert_soquets_used_exactly_once(cbloq: CompositeBloq):
@@ -195,16 +218,10 @@ def assert_soquets_used_exactly_once(cbloq: CompositeBloq):
     Each bloq's register produces prod(reg.shape) soquets which must be consumed
     once and only once.
     """
-    produced = set()
-    consumed = set()
+    produced: Set[Soquet] = set()
+    consumed: Set[Soquet] = set()
     for cxn in cbloq.connections:
-        if cxn.left in produced:
-            raise BloqError(f"{cxn}'s left side had already been produced by a different bloq.")
-        produced.add(cxn.left)
-
-        if cxn.right in consumed:
-            raise BloqError(f"{cxn}'s right side had already been consumed by a different bloq")
-        consumed.add(cxn.right)
+        _check_soquets_used_once(cxn, produced, consumed)
 
     diff1 = produced - cbloq.all_soquets
     if diff1:
@@ -214,12 +231,33 @@ def assert_soquets_used_exactly_once(cbloq: CompositeBloq):
         raise BloqError(f"Some soquets were not produced: {diff2}")
 
 
+def _check_soquets_used_once(cxn: Connection, produced: Set[Soquet], consumed: Set[Soquet]):
+    """Helper for `assert_soquets_used_exactly_once` that checks and records a connection."""
+    if cxn.left in produced:
+        raise BloqError(f"{cxn}'s left side had already been produced by a different bloq.")
+    produced.add(cxn.left)
+
+    if cxn.right in consumed:
+        raise BloqError(f"{cxn}'s right side had already been consumed by a different bloq")
+    consumed.add(cxn.right)
+
+
 def assert_valid_cbloq(cbloq: CompositeBloq):
-    """Perform all composite-bloq validity assertions."""
-    assert_registers_match_dangling(cbloq)
-    assert_connections_compatible(cbloq)
-    assert_soquets_belong_to_registers(cbloq)
-    assert_soquets_used_exactly_once(cbloq)
+    """Perform all composite-bloq validity assertions.
+
+    This performs the checks of `assert_registers_match_dangling`,
+    `assert_connections_compatible`, `assert_soquets_belong_to_registers`, and
+    `assert_soquets_used_exactly_once` in a single pass over the connections.
+    """
+    dangling_checker = _DanglingChecker(cbloq)
+    produced: Set[Soquet] = set()
+    consumed: Set[Soquet] = set()
+    for cxn in cbloq.connections:
+        dangling_checker.check(cxn)
+        _check_connection_compatible(cxn)
+        _check_soquet_belongs_to_register(cxn.left)
+        _check_soquet_belongs_to_register(cxn.right)
+        _check_soquets_used_once(cxn, produced, consumed)
 
 
 def assert_valid_bloq_decomposition(bloq: Optional[Bloq]) -> CompositeBloq:
@@ -286,6 +324,39 @@ def execute_notebook(name: str):
     ep.preprocess(nb)
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_notebook(notebook_path: Path, mtime_ns: int) -> CodeType:
+    """Compile the concatenated code cells of a notebook.
+
+    `mtime_ns` is only used as part of the cache key so edited notebooks are recompiled.
+    """
+    import nbformat
+
+    with notebook_path.open() as f:
+        nb = nbformat.read(f, as_version=4)
+    source = '\n\n'.join(cell.source for cell in nb.cells if cell.cell_type == 'code')
+    return compile(source, str(notebook_path), 'exec')
+
+
+def execute_notebook_fast(name: str):
+    """Execute the code cells of a jupyter notebook in the caller's directory in-process.
+
+    Unlike `execute_notebook`, this does not start a Jupyter kernel: the code cells are
+    compiled once (and cached until the notebook file changes) and run with `exec` in a
+    fresh namespace. This only supports notebooks whose cells are plain Python, i.e.
+    without IPython magics or shell escapes.
+
+    Args:
+        name: The name of the notebook without extension.
+
+    """
+    # Assumes that the notebook is in the same path from where the function was called,
+    # which may be different from `__file__`.
+    notebook_path = Path(traceback.extract_stack()[-2].filename).parent / f"{name}.ipynb"
+    code = _compile_notebook(notebook_path, notebook_path.stat().st_mtime_ns)
+    exec(code, {'__name__': '__main__'})  # pylint: disable=exec-used
+
+
 class BloqCheckResult(Enum):
     """The status result of the `check_bloq_example_xxx` functions."""
 
@@ -14,7 +14,6 @@
 import re
 from functools import cached_property
 
-import attrs
 import pytest
 from attrs import frozen
 
@@ -49,6 +48,7 @@ from qualtran.testing import (
     assert_registers_match_parent,
     assert_soquets_belong_to_registers,
     assert_soquets_used_exactly_once,
+    assert_valid_cbloq,
     BloqCheckException,
     BloqCheckResult,
     check_bloq_example_decompose,
@@ -118,12 +118,14 @@ def test_assert_registers_match_dangling():
 
 def test_assert_soquets_belong_to_registers():
     cxns, signature = _manually_make_test_cbloq_cxns()
-    cxns[3] = attrs.evolve(cxns[3], left=attrs.evolve(cxns[3].left, reg=Register('q3', QBit())))
+    cxns[3] = Connection(Soquet(cxns[3].left.binst, Register('q3', QBit())), cxns[3].right)
     cbloq = CompositeBloq(cxns, signature)
     assert_registers_match_dangling(cbloq)
     assert_connections_compatible(cbloq)
     with pytest.raises(BloqError, match=r".*register doesn't exist on its bloq.*"):
         assert_soquets_belong_to_registers(cbloq)
+    with pytest.raises(BloqError, match=r".*register doesn't exist on its bloq.*"):
+        assert_valid_cbloq(cbloq)
 
 
 def test_assert_soquets_used_exactly_once():
@@ -139,6 +141,8 @@ def test_assert_soquets_used_exactly_once():
     assert_soquets_belong_to_registers(cbloq)
     with pytest.raises(BloqError, match=r".*had already been produced by a different bloq.*"):
         assert_soquets_used_exactly_once(cbloq)
+    with pytest.raises(BloqError, match=r".*had already been produced by a different bloq.*"):
+        assert_valid_cbloq(cbloq)
 
 
 def test_check_bloq_example_make():